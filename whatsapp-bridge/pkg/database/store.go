@@ -72,14 +72,142 @@ func (s *Store) initTables() error {
 		);
 
 		-- Performance indexes
-		CREATE INDEX IF NOT EXISTS idx_messages_chat_jid ON messages(chat_jid);
+		CREATE INDEX IF NOT EXISTS idx_messages_chat_timestamp ON messages(chat_jid, timestamp);
 		CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON messages(timestamp);
-		CREATE INDEX IF NOT EXISTS idx_messages_sender ON messages(sender);
+		CREATE INDEX IF NOT EXISTS idx_messages_sender_nocase ON messages(sender COLLATE NOCASE);
 		CREATE INDEX IF NOT EXISTS idx_chats_last_message_time ON chats(last_message_time);
+		CREATE INDEX IF NOT EXISTS idx_chats_name_nocase ON chats(name COLLATE NOCASE);
+		CREATE INDEX IF NOT EXISTS idx_chats_jid_nocase ON chats(jid COLLATE NOCASE);
+
+		-- Superseded by idx_messages_chat_timestamp and idx_messages_sender_nocase
+		DROP INDEX IF EXISTS idx_messages_chat_jid;
+		DROP INDEX IF EXISTS idx_messages_sender;
 	`
 	
-	_, err := s.db.Exec(schema)
-	return err
+	if _, err := s.db.Exec(schema); err != nil {
+		return err
+	}
+
+	return s.initSearchIndex()
+}
+
+// messagesSearchSchema defines the full-text index over message content and
+// the triggers that keep it in sync with the messages table. FTS4 is used
+// because go-sqlite3 compiles it in by default, while FTS5 needs the
+// sqlite_fts5 build tag. The BEFORE INSERT trigger covers INSERT OR REPLACE,
+// which removes the conflicting row without firing delete triggers.
+const messagesSearchSchema = `
+	CREATE VIRTUAL TABLE messages_fts USING fts4(
+		content="messages",
+		content,
+		tokenize=unicode61 "remove_diacritics=2"
+	);
+
+	CREATE TRIGGER messages_fts_bi BEFORE INSERT ON messages BEGIN
+		DELETE FROM messages_fts WHERE docid IN (
+			SELECT rowid FROM messages WHERE id = new.id AND chat_jid = new.chat_jid
+		);
+	END;
+
+	CREATE TRIGGER messages_fts_ai AFTER INSERT ON messages BEGIN
+		INSERT INTO messages_fts(docid, content) VALUES (new.rowid, new.content);
+	END;
+
+	CREATE TRIGGER messages_fts_bu BEFORE UPDATE ON messages BEGIN
+		DELETE FROM messages_fts WHERE docid = old.rowid;
+	END;
+
+	CREATE TRIGGER messages_fts_au AFTER UPDATE ON messages BEGIN
+		INSERT INTO messages_fts(docid, content) VALUES (new.rowid, new.content);
+	END;
+
+	CREATE TRIGGER messages_fts_bd BEFORE DELETE ON messages BEGIN
+		DELETE FROM messages_fts WHERE docid = old.rowid;
+	END;
+`
+
+// chatsSearchSchema defines the full-text index over chat names and JIDs,
+// maintained the same way as messages_fts
+const chatsSearchSchema = `
+	CREATE VIRTUAL TABLE chats_fts USING fts4(
+		content="chats",
+		name,
+		jid,
+		tokenize=unicode61 "remove_diacritics=2"
+	);
+
+	CREATE TRIGGER chats_fts_bi BEFORE INSERT ON chats BEGIN
+		DELETE FROM chats_fts WHERE docid IN (
+			SELECT rowid FROM chats WHERE jid = new.jid
+		);
+	END;
+
+	CREATE TRIGGER chats_fts_ai AFTER INSERT ON chats BEGIN
+		INSERT INTO chats_fts(docid, name, jid) VALUES (new.rowid, new.name, new.jid);
+	END;
+
+	CREATE TRIGGER chats_fts_bu BEFORE UPDATE ON chats BEGIN
+		DELETE FROM chats_fts WHERE docid = old.rowid;
+	END;
+
+	CREATE TRIGGER chats_fts_au AFTER UPDATE ON chats BEGIN
+		INSERT INTO chats_fts(docid, name, jid) VALUES (new.rowid, new.name, new.jid);
+	END;
+
+	CREATE TRIGGER chats_fts_bd BEFORE DELETE ON chats BEGIN
+		DELETE FROM chats_fts WHERE docid = old.rowid;
+	END;
+`
+
+// searchIndexes lists the full-text indexes and the schema creating each one
+var searchIndexes = []struct {
+	name   string
+	schema string
+}{
+	{"messages_fts", messagesSearchSchema},
+	{"chats_fts", chatsSearchSchema},
+}
+
+// initSearchIndex creates any missing search index and populates it from the
+// rows already stored
+func (s *Store) initSearchIndex() error {
+	for _, index := range searchIndexes {
+		var count int
+		err := s.db.QueryRow(
+			"SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?", index.name,
+		).Scan(&count)
+		if err != nil {
+			return fmt.Errorf("failed to check search index %s: %w", index.name, err)
+		}
+		if count > 0 {
+			continue
+		}
+
+		if err := s.createSearchIndex(index.name, index.schema); err != nil {
+			return err
+		}
+	}
+
+	return nil
+}
+
+// createSearchIndex creates a search index and builds it in one transaction
+func (s *Store) createSearchIndex(name, schema string) error {
+	tx, err := s.db.Begin()
+	if err != nil {
+		return err
+	}
+	defer tx.Rollback()
+
+	if _, err := tx.Exec(schema); err != nil {
+		return fmt.Errorf("failed to create search index %s: %w", name, err)
+	}
+	rebuild := fmt.Sprintf("INSERT INTO %s(%s) VALUES('rebuild')", name, name)
+	if _, err := tx.Exec(rebuild); err != nil {
+		return fmt.Errorf("failed to populate search index %s: %w", name, err)
+	}
+
+	return tx.Commit()
 }
 
 // StoreChat inserts or updates a chat record
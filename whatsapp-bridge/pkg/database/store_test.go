@@ -94,6 +94,96 @@ func TestStoreMessage(t *testing.T) {
 	}
 }
 
+func TestMessageSearchIndex(t *testing.T) {
+	store, cleanup := setupTestStore(t)
+	defer cleanup()
+	
+	chat := &Chat{
+		JID:             "123456789@s.whatsapp.net",
+		Name:            "Test Contact",
+		LastMessageTime: time.Now(),
+	}
+	store.StoreChat(chat)
+	
+	message := &Message{
+		ID:        "msg123",
+		ChatJID:   chat.JID,
+		Sender:    "123456789@s.whatsapp.net",
+		Content:   "Original text",
+		Timestamp: time.Now(),
+	}
+	if err := store.StoreMessage(message); err != nil {
+		t.Fatalf("Failed to store message: %v", err)
+	}
+	
+	// Replacing the message must drop the old content from the index
+	message.Content = "Edited text"
+	if err := store.StoreMessage(message); err != nil {
+		t.Fatalf("Failed to replace message: %v", err)
+	}
+	
+	tests := []struct {
+		query    string
+		expected int
+	}{
+		{"original", 0},
+		{"edited", 1},
+	}
+	
+	for _, test := range tests {
+		var count int
+		err := store.db.QueryRow(
+			"SELECT COUNT(*) FROM messages_fts WHERE messages_fts MATCH ?", test.query,
+		).Scan(&count)
+		if err != nil {
+			t.Fatalf("Failed to search messages: %v", err)
+		}
+		if count != test.expected {
+			t.Errorf("For query %s, expected %d matches, got %d", test.query, test.expected, count)
+		}
+	}
+}
+
+func TestChatSearchIndex(t *testing.T) {
+	store, cleanup := setupTestStore(t)
+	defer cleanup()
+	
+	chat := &Chat{
+		JID:             "123456789@s.whatsapp.net",
+		Name:            "Old Name",
+		LastMessageTime: time.Now(),
+	}
+	store.StoreChat(chat)
+	
+	// Renaming the chat must drop the old name from the index
+	chat.Name = "New Name"
+	if err := store.StoreChat(chat); err != nil {
+		t.Fatalf("Failed to replace chat: %v", err)
+	}
+	
+	tests := []struct {
+		query    string
+		expected int
+	}{
+		{"old", 0},
+		{"new", 1},
+		{"123456789", 1},
+	}
+	
+	for _, test := range tests {
+		var count int
+		err := store.db.QueryRow(
+			"SELECT COUNT(*) FROM chats_fts WHERE chats_fts MATCH ?", test.query,
+		).Scan(&count)
+		if err != nil {
+			t.Fatalf("Failed to search chats: %v", err)
+		}
+		if count != test.expected {
+			t.Errorf("For query %s, expected %d matches, got %d", test.query, test.expected, count)
+		}
+	}
+}
+
 func TestChatIsGroup(t *testing.T) {
 	tests := []struct {
 		jid      string
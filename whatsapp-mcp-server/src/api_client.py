@@ -1,8 +1,21 @@
 """HTTP API client for WhatsApp bridge communication."""
 
+import asyncio
+import httpx
+import orjson
 import requests
 import logging
-from typing import Optional, Dict, Any, Tuple
+import mimetypes
+import socket
+import time
+from importlib.util import find_spec
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
+from urllib3.connection import HTTPConnection
+from urllib3.util import Retry
+from typing import (
+    Optional, Dict, Any, AsyncIterator, BinaryIO, Iterable, List, Tuple, Union
+)
 from pathlib import Path
 
 from .config import config
@@ -11,19 +24,191 @@ from .validation import validate_recipient, validate_file_path
 
 logger = logging.getLogger(__name__)
 
+# Connection pool and retry settings for the bridge session; read and status
+# retries are limited to idempotent methods so a /send is never delivered
+# twice, while connection errors are retried for every method
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 64
+RETRY_POLICY = Retry(
+    total=3,
+    backoff_factor=0.2,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset(['GET', 'HEAD']),
+    raise_on_status=False
+)
+
+# Health checks use a short timeout and reuse a recent result
+HEALTH_CHECK_TIMEOUT = 2
+HEALTH_CHECK_TTL = 5
+
+# HTTP/2 is only negotiated when the optional h2 package is installed
+HTTP2_AVAILABLE = find_spec('h2') is not None
+
+# Async uploads read the multipart body in chunks of this size
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Transport failures raised by either HTTP client
+NETWORK_ERRORS = (requests.RequestException, httpx.HTTPError)
+
+# Responses from either HTTP client share status_code, text, content and json()
+BridgeResponse = Union[requests.Response, httpx.Response]
+
 
 class APIError(Exception):
     """API communication error."""
     pass
 
 
+class NoDelayAdapter(HTTPAdapter):
+    """HTTP adapter that disables Nagle's algorithm on pooled sockets."""
+    
+    socket_options = HTTPConnection.default_socket_options + [
+        option for option in (
+            (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        )
+        if option not in HTTPConnection.default_socket_options
+    ]
+    
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        """Create the pool manager with TCP_NODELAY and SO_KEEPALIVE set."""
+        kwargs['socket_options'] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _message_payload(recipient: str, message: str) -> Optional[Dict[str, str]]:
+    """Validate a text message and build its request body, or None if empty."""
+    validate_recipient(recipient)
+    
+    if not message.strip():
+        return None
+    
+    return {
+        'recipient': recipient,
+        'message': message
+    }
+
+
+def _download_payload(message_id: str, chat_jid: str) -> Optional[Dict[str, str]]:
+    """Build a media download request body, or None if an ID is missing."""
+    if not message_id or not chat_jid:
+        logger.error("Message ID and Chat JID are required for media download")
+        return None
+    
+    return {
+        'message_id': message_id,
+        'chat_jid': chat_jid
+    }
+
+
+def _file_encoder(recipient: str, file_path: str, file: BinaryIO) -> MultipartEncoder:
+    """Build a multipart body that streams the open file in chunks."""
+    file_name = Path(file_path).name
+    content_type = mimetypes.guess_type(file_name)[0] or 'application/octet-stream'
+    return MultipartEncoder(fields={
+        'recipient': recipient,
+        'file': (file_name, file, content_type)
+    })
+
+
+async def _aiter_encoder(encoder: MultipartEncoder) -> AsyncIterator[bytes]:
+    """Yield a multipart body read in a worker thread, off the event loop."""
+    while chunk := await asyncio.to_thread(encoder.read, UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+
+def _send_result(response: BridgeResponse) -> Tuple[bool, str]:
+    """Read the (success, message) result of a send response."""
+    if response.status_code == 200:
+        data = response.json()
+        return data.get('success', False), data.get('message', 'Unknown error')
+    
+    return False, f"HTTP {response.status_code}: {response.text}"
+
+
+def _download_result(response: BridgeResponse) -> Optional[str]:
+    """Read the downloaded file path from a download response."""
+    if response.status_code != 200:
+        logger.error(f"Download HTTP error {response.status_code}: {response.text}")
+        return None
+    
+    data = response.json()
+    if not data.get('success'):
+        logger.error(f"Download failed: {data.get('message', 'Unknown error')}")
+        return None
+    
+    file_path: Optional[str] = data.get('file_path')
+    return file_path
+
+
+def _request_failed(action: str, error: Exception) -> Tuple[bool, str]:
+    """Log a failed bridge request and build its (success, message) result."""
+    if isinstance(error, NETWORK_ERRORS):
+        logger.error(f"Failed to {action}: {error}")
+        return False, f"Network error: {error}"
+    
+    logger.error(f"Unexpected error trying to {action}: {error}")
+    return False, f"Unexpected error: {error}"
+
+
+class _HealthCache:
+    """Last health check result, reused for HEALTH_CHECK_TTL seconds."""
+    
+    def __init__(self) -> None:
+        self._checked_at: Optional[float] = None
+        self._healthy = False
+    
+    def get(self) -> Optional[bool]:
+        """Get the cached result, or None if there is no fresh one."""
+        if self._checked_at is None:
+            return None
+        if time.monotonic() - self._checked_at >= HEALTH_CHECK_TTL:
+            return None
+        return self._healthy
+    
+    def set(self, healthy: bool) -> bool:
+        """Cache a result, failures included, and return it."""
+        self._checked_at = time.monotonic()
+        self._healthy = healthy
+        return healthy
+
+
+def _log_response(response: BridgeResponse) -> None:
+    """Log the start of a response body; callers check the DEBUG level."""
+    logger.debug(f"Response: {response.status_code} {response.content[:200]!r}")
+
+
 class WhatsAppAPIClient:
     """Client for communicating with WhatsApp bridge API."""
     
-    def __init__(self, base_url: str = None, timeout: int = None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: Optional[int] = None
+    ) -> None:
         self.base_url = base_url or config.whatsapp_api_base_url
         self.timeout = timeout or config.api_timeout
         self.session = requests.Session()
+        self._health = _HealthCache()
+        
+        # Keep connections to the bridge warm and retry transient failures
+        adapter = NoDelayAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            max_retries=RETRY_POLICY
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # Requests that must not be retried share the main session's headers
+        # and cookies but use an adapter without retries: streamed uploads
+        # cannot be rewound, and health probes must fail within their timeout
+        self._no_retry_session = requests.Session()
+        self._no_retry_session.headers = self.session.headers
+        self._no_retry_session.cookies = self.session.cookies
+        no_retry_adapter = NoDelayAdapter(max_retries=0)
+        self._no_retry_session.mount('http://', no_retry_adapter)
+        self._no_retry_session.mount('https://', no_retry_adapter)
         
         # Set default headers
         self.session.headers.update({
@@ -33,31 +218,14 @@ class WhatsAppAPIClient:
     
     def send_message(self, recipient: str, message: str) -> Tuple[bool, str]:
         """Send a text message."""
-        validate_recipient(recipient)
-        
-        if not message.strip():
+        payload = _message_payload(recipient, message)
+        if payload is None:
             return False, "Message content cannot be empty"
         
-        payload = {
-            'recipient': recipient,
-            'message': message
-        }
-        
         try:
-            response = self._post('/send', payload)
-            
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('success', False), data.get('message', 'Unknown error')
-            else:
-                return False, f"HTTP {response.status_code}: {response.text}"
-                
-        except requests.RequestException as e:
-            logger.error(f"Failed to send message: {e}")
-            return False, f"Network error: {e}"
+            return _send_result(self._post('/send', payload))
         except Exception as e:
-            logger.error(f"Unexpected error sending message: {e}")
-            return False, f"Unexpected error: {e}"
+            return _request_failed("send message", e)
     
     def send_file(self, recipient: str, file_path: str) -> Tuple[bool, str]:
         """Send a file."""
@@ -66,84 +234,69 @@ class WhatsAppAPIClient:
         
         try:
             with open(validated_path, 'rb') as f:
-                files = {'file': (Path(validated_path).name, f)}
-                data = {'recipient': recipient}
-                
-                response = self.session.post(
+                # Stream the upload in chunks instead of building the whole
+                # multipart body in memory
+                encoder = _file_encoder(recipient, validated_path, f)
+                response = self._no_retry_session.post(
                     f"{self.base_url}/send",
-                    data=data,
-                    files=files,
-                    timeout=self.timeout
+                    data=encoder,
+                    headers={'Content-Type': encoder.content_type},
+                    timeout=self.timeout,
+                    verify=self.session.verify,
+                    cert=self.session.cert,
+                    proxies=self.session.proxies
                 )
             
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('success', False), data.get('message', 'Unknown error')
-            else:
-                return False, f"HTTP {response.status_code}: {response.text}"
-                
+            return _send_result(response)
         except FileNotFoundError:
             return False, f"File not found: {file_path}"
-        except requests.RequestException as e:
-            logger.error(f"Failed to send file: {e}")
-            return False, f"Network error: {e}"
         except Exception as e:
-            logger.error(f"Unexpected error sending file: {e}")
-            return False, f"Unexpected error: {e}"
+            return _request_failed("send file", e)
     
     def download_media(self, message_id: str, chat_jid: str) -> Optional[str]:
         """Download media from a message."""
-        if not message_id or not chat_jid:
-            logger.error("Message ID and Chat JID are required for media download")
+        payload = _download_payload(message_id, chat_jid)
+        if payload is None:
             return None
         
-        payload = {
-            'message_id': message_id,
-            'chat_jid': chat_jid
-        }
-        
         try:
-            response = self._post('/download', payload)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success'):
-                    return data.get('file_path')
-                else:
-                    logger.error(f"Download failed: {data.get('message', 'Unknown error')}")
-                    return None
-            else:
-                logger.error(f"Download HTTP error {response.status_code}: {response.text}")
-                return None
-                
-        except requests.RequestException as e:
-            logger.error(f"Failed to download media: {e}")
-            return None
+            return _download_result(self._post('/download', payload))
         except Exception as e:
-            logger.error(f"Unexpected error downloading media: {e}")
+            _request_failed("download media", e)
             return None
     
     def _post(self, endpoint: str, data: Dict[str, Any]) -> requests.Response:
         """Make a POST request to the API."""
         url = f"{self.base_url}{endpoint}"
         
-        logger.debug(f"POST {url} with data: {data}")
+        # Skip formatting payloads and decoding bodies unless debugging
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug(f"POST {url} with data: {data}")
         
         response = self.session.post(
             url,
-            json=data,
+            data=orjson.dumps(data),
+            headers={'Content-Type': 'application/json'},
             timeout=self.timeout
         )
         
-        logger.debug(f"Response: {response.status_code} {response.text[:200]}")
+        if debug:
+            _log_response(response)
         
         return response
     
-    def _get(self, endpoint: str, params: Dict[str, Any] = None) -> requests.Response:
+    def _get(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> requests.Response:
         """Make a GET request to the API."""
         url = f"{self.base_url}{endpoint}"
         
-        logger.debug(f"GET {url} with params: {params}")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug(f"GET {url} with params: {params}")
         
         response = self.session.get(
             url,
@@ -151,22 +304,185 @@ class WhatsAppAPIClient:
             timeout=self.timeout
         )
         
-        logger.debug(f"Response: {response.status_code} {response.text[:200]}")
+        if debug:
+            _log_response(response)
         
         return response
     
     def health_check(self) -> bool:
         """Check if the API is responding."""
+        cached = self._health.get()
+        if cached is not None:
+            return cached
+        
         try:
-            response = self._get('/health')
-            return response.status_code == 200
+            response = self._no_retry_session.head(
+                f"{self.base_url}/health",
+                timeout=HEALTH_CHECK_TIMEOUT,
+                verify=self.session.verify,
+                cert=self.session.cert,
+                proxies=self.session.proxies
+            )
+            healthy = response.status_code == 200
         except Exception:
-            return False
+            healthy = False
+        
+        return self._health.set(healthy)
     
-    def close(self):
+    def close(self) -> None:
         """Close the HTTP session."""
         self.session.close()
+        self._no_retry_session.close()
+
+
+class AsyncWhatsAppAPIClient:
+    """Asynchronous client for communicating with WhatsApp bridge API."""
+    
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ) -> None:
+        self.base_url = base_url or config.whatsapp_api_base_url
+        self.timeout = timeout or config.api_timeout
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            transport=transport,
+            http2=HTTP2_AVAILABLE,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_keepalive_connections=POOL_CONNECTIONS,
+                max_connections=POOL_MAXSIZE
+            ),
+            headers={'User-Agent': 'WhatsApp-MCP-Client/1.0'}
+        )
+        self._health = _HealthCache()
+    
+    async def send_message(self, recipient: str, message: str) -> Tuple[bool, str]:
+        """Send a text message."""
+        payload = _message_payload(recipient, message)
+        if payload is None:
+            return False, "Message content cannot be empty"
+        
+        try:
+            return _send_result(await self._post('/send', payload))
+        except Exception as e:
+            return _request_failed("send message", e)
+    
+    async def send_file(self, recipient: str, file_path: str) -> Tuple[bool, str]:
+        """Send a file."""
+        validate_recipient(recipient)
+        validated_path = validate_file_path(file_path)
+        
+        try:
+            # Open and read the file in worker threads so a large upload
+            # never blocks the event loop
+            f = await asyncio.to_thread(open, validated_path, 'rb')
+            try:
+                encoder = _file_encoder(recipient, validated_path, f)
+                response = await self._client.post(
+                    '/send',
+                    content=_aiter_encoder(encoder),
+                    headers={
+                        'Content-Type': encoder.content_type,
+                        'Content-Length': str(encoder.len)
+                    }
+                )
+            finally:
+                f.close()
+            
+            return _send_result(response)
+        except FileNotFoundError:
+            return False, f"File not found: {file_path}"
+        except Exception as e:
+            return _request_failed("send file", e)
+    
+    async def download_media(self, message_id: str, chat_jid: str) -> Optional[str]:
+        """Download media from a message."""
+        payload = _download_payload(message_id, chat_jid)
+        if payload is None:
+            return None
+        
+        try:
+            return _download_result(await self._post('/download', payload))
+        except Exception as e:
+            _request_failed("download media", e)
+            return None
+    
+    async def download_many(
+        self,
+        items: Iterable[Tuple[str, str]],
+        concurrency: int = 8
+    ) -> List[Optional[str]]:
+        """Download media for several (message_id, chat_jid) pairs concurrently."""
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def download_one(message_id: str, chat_jid: str) -> Optional[str]:
+            async with semaphore:
+                return await self.download_media(message_id, chat_jid)
+        
+        # Results keep the order of items; failed downloads are None
+        return await asyncio.gather(
+            *(download_one(message_id, chat_jid) for message_id, chat_jid in items)
+        )
+    
+    async def _post(self, endpoint: str, data: Dict[str, Any]) -> httpx.Response:
+        """Make a POST request to the API."""
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug(f"POST {self.base_url}{endpoint} with data: {data}")
+        
+        response = await self._client.post(
+            endpoint,
+            content=orjson.dumps(data),
+            headers={'Content-Type': 'application/json'}
+        )
+        
+        if debug:
+            _log_response(response)
+        
+        return response
+    
+    async def _get(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> httpx.Response:
+        """Make a GET request to the API."""
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug(f"GET {self.base_url}{endpoint} with params: {params}")
+        
+        response = await self._client.get(endpoint, params=params)
+        
+        if debug:
+            _log_response(response)
+        
+        return response
+    
+    async def health_check(self) -> bool:
+        """Check if the API is responding."""
+        cached = self._health.get()
+        if cached is not None:
+            return cached
+        
+        try:
+            response = await self._client.head('/health', timeout=HEALTH_CHECK_TIMEOUT)
+            healthy = response.status_code == 200
+        except Exception:
+            healthy = False
+        
+        return self._health.set(healthy)
+    
+    async def close(self) -> None:
+        """Close the HTTP client."""
+        await self._client.aclose()
 
 
-# Global API client instance
-api_client = WhatsAppAPIClient()
\ No newline at end of file
+# Global API client instances
+api_client = WhatsAppAPIClient()
+async_api_client = AsyncWhatsAppAPIClient()
\ No newline at end of file
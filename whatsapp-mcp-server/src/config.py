@@ -25,7 +25,7 @@ class Config:
     
     # Security settings
     max_message_length: int
-    allowed_file_types: list[str]
+    allowed_file_types: frozenset[str]
 
 
 def load_config() -> Config:
@@ -61,10 +61,13 @@ def load_config() -> Config:
         
         # Security
         max_message_length=int(os.getenv('WHATSAPP_MAX_MESSAGE_LENGTH', '4096')),
-        allowed_file_types=os.getenv(
-            'WHATSAPP_ALLOWED_FILE_TYPES',
-            'jpg,jpeg,png,gif,webp,mp4,mov,avi,mp3,wav,ogg,m4a,pdf,doc,docx,txt'
-        ).split(','),
+        allowed_file_types=frozenset(
+            file_type.strip().lower()
+            for file_type in os.getenv(
+                'WHATSAPP_ALLOWED_FILE_TYPES',
+                'jpg,jpeg,png,gif,webp,mp4,mov,avi,mp3,wav,ogg,m4a,pdf,doc,docx,txt'
+            ).split(',')
+        ),
     )
 
 
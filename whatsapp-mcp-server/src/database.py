@@ -1,8 +1,12 @@
 """Database operations for WhatsApp MCP server."""
 
+import re
 import sqlite3
 import logging
+import threading
+from collections import namedtuple
 from contextlib import contextmanager
+from functools import lru_cache
 from typing import List, Optional, Tuple, Dict, Any
 from datetime import datetime
 
@@ -17,35 +21,175 @@ class DatabaseError(Exception):
     pass
 
 
+# Applied once when the shared connection is opened
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",  # 256MB
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64MB
+)
+
+# Words in a search query, matching how the unicode61 tokenizer splits text
+SEARCH_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def build_fts_query(query: str) -> Optional[str]:
+    """Build a full-text prefix phrase query, or None if nothing is searchable."""
+    tokens = SEARCH_TOKEN_PATTERN.findall(query)
+    if not tokens:
+        return None
+    
+    # Quoting makes the input a phrase so FTS operators in it are not parsed;
+    # the trailing * lets the last word match as a prefix. FTS only matches
+    # from the start of a token, so unlike LIKE '%...%' a fragment from the
+    # middle of a word ("ello" in "Hello") does not match
+    return '"' + ' '.join(tokens) + '*"'
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so value matches literally with ESCAPE '\\'."""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+@lru_cache(maxsize=64)
+def _row_type(columns: Tuple[str, ...]) -> Any:
+    """Get the named tuple type for a result column layout."""
+    return namedtuple('Row', columns, rename=True)
+
+
+# SQL statements are module constants so repeated calls hand SQLite the same
+# text and hit the connection's prepared statement cache
+_Q_TABLE_EXISTS = "SELECT 1 FROM sqlite_master WHERE name = ?"
+
+_Q_SEARCH_MESSAGES_TEMPLATE = """
+    SELECT messages.*, chats.name as chat_name
+    FROM {from_clause}
+    LEFT JOIN chats ON messages.chat_jid = chats.jid
+    WHERE {where_clause}
+    ORDER BY messages.timestamp DESC
+    LIMIT ? OFFSET ?
+"""
+
+# Target, preceding and following messages in a single round trip; each row
+# is tagged with the bucket it belongs to
+_Q_MESSAGE_CONTEXT = """
+    WITH target AS (
+        SELECT rowid AS target_rowid, chat_jid, timestamp
+        FROM messages
+        WHERE id = ?
+        LIMIT 1
+    )
+    SELECT * FROM (
+        SELECT messages.*, chats.name as chat_name, 'target' as bucket
+        FROM messages
+        JOIN target ON messages.rowid = target.target_rowid
+        LEFT JOIN chats ON messages.chat_jid = chats.jid
+    )
+    UNION ALL
+    SELECT * FROM (
+        SELECT messages.*, chats.name as chat_name, 'before' as bucket
+        FROM messages
+        JOIN target ON messages.chat_jid = target.chat_jid
+        LEFT JOIN chats ON messages.chat_jid = chats.jid
+        WHERE messages.timestamp < target.timestamp
+        ORDER BY messages.timestamp DESC
+        LIMIT ?
+    )
+    UNION ALL
+    SELECT * FROM (
+        SELECT messages.*, chats.name as chat_name, 'after' as bucket
+        FROM messages
+        JOIN target ON messages.chat_jid = target.chat_jid
+        LEFT JOIN chats ON messages.chat_jid = chats.jid
+        WHERE messages.timestamp > target.timestamp
+        ORDER BY messages.timestamp ASC
+        LIMIT ?
+    )
+    ORDER BY timestamp ASC
+"""
+
+_Q_SEARCH_CHATS_TEMPLATE = """
+    SELECT jid, name, last_message_time
+    FROM chats
+    WHERE {where_clause}
+    ORDER BY {order_by}
+    LIMIT ? OFFSET ?
+"""
+
+_Q_CHAT_BY_JID = "SELECT jid, name, last_message_time FROM chats WHERE jid = ?"
+
+
 class DatabaseManager:
     """Manages database connections and operations."""
     
     def __init__(self, db_path: str = None):
         self.db_path = db_path or config.database_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._tables: Dict[str, bool] = {}
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the shared connection and apply performance pragmas."""
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            detect_types=0,  # Timestamps are parsed by the repositories
+            cached_statements=512
+        )
+        try:
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
         
     @contextmanager
     def get_connection(self):
-        """Get a database connection with proper error handling."""
-        conn = None
-        try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # Enable dict-like access
-            yield conn
-        except sqlite3.Error as e:
-            if conn:
-                conn.rollback()
-            logger.error(f"Database error: {e}")
-            raise DatabaseError(f"Database operation failed: {e}")
-        finally:
-            if conn:
-                conn.close()
-    
-    def execute_query(self, query: str, params: Tuple = ()) -> List[sqlite3.Row]:
-        """Execute a SELECT query and return results."""
+        """Get the shared database connection with proper error handling."""
+        with self._lock:
+            try:
+                # Opened lazily so importing the module never touches the database
+                if self._conn is None:
+                    self._conn = self._connect()
+                yield self._conn
+            except sqlite3.Error as e:
+                if self._conn and self._conn.in_transaction:
+                    self._conn.rollback()
+                logger.error(f"Database error: {e}")
+                raise DatabaseError(f"Database operation failed: {e}")
+    
+    def close(self) -> None:
+        """Close the shared database connection."""
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+            # Tables created while closed are seen after reconnecting
+            self._tables.clear()
+    
+    def execute_query(self, query: str, params: Tuple = ()) -> List[Any]:
+        """Execute a SELECT query and return results as named tuples."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
-            return cursor.fetchall()
+            if cursor.description is None:
+                return []
+            
+            # Plain tuples are fetched in C and wrapped once per row; the
+            # named tuple type is built once per column layout
+            row_type = _row_type(tuple(column[0] for column in cursor.description))
+            return list(map(row_type._make, cursor.fetchall()))
+    
+    def has_table(self, name: str) -> bool:
+        """Check whether a table exists, caching the answer until close()."""
+        exists = self._tables.get(name)
+        if exists is None:
+            exists = bool(self.execute_query(_Q_TABLE_EXISTS, (name,)))
+            self._tables[name] = exists
+        return exists
     
     def execute_update(self, query: str, params: Tuple = ()) -> int:
         """Execute an INSERT/UPDATE/DELETE query and return affected rows."""
@@ -70,14 +214,33 @@ class MessageRepository:
         after: Optional[datetime] = None,
         before: Optional[datetime] = None,
         limit: int = 20,
-        offset: int = 0
+        offset: int = 0,
+        raw_timestamp: bool = False
     ) -> List[Message]:
-        """Search messages with filters."""
+        """Search messages with filters.
+        
+        When the bridge has built messages_fts, query matches whole words in
+        order, with the last word matched as a prefix: "hello wor" finds
+        "Hello world" but "ello" does not. Without the index it falls back to
+        a case-insensitive substring match.
+        
+        With raw_timestamp, message timestamps are left as the stored ISO
+        strings, skipping the parse for callers that only serialize them.
+        """
         
         conditions = []
-        params = []
+        params: List[Any] = []
+        from_clause = "messages"
         
-        if query:
+        # Use the full-text index when the bridge has created it
+        fts_query = build_fts_query(query) if query else None
+        if fts_query and self.db.has_table('messages_fts'):
+            from_clause = (
+                "messages_fts JOIN messages ON messages.rowid = messages_fts.docid"
+            )
+            conditions.append("messages_fts MATCH ?")
+            params.append(fts_query)
+        elif query:
             conditions.append("LOWER(messages.content) LIKE LOWER(?)")
             params.append(f"%{query}%")
         
@@ -86,8 +249,9 @@ class MessageRepository:
             params.append(chat_jid)
         
         if sender_phone_number:
-            conditions.append("messages.sender LIKE ?")
-            params.append(f"%{sender_phone_number}%")
+            # Prefix match so idx_messages_sender_nocase can serve the lookup
+            conditions.append("messages.sender LIKE ? ESCAPE '\\'")
+            params.append(f"{escape_like(sender_phone_number)}%")
         
         if after:
             conditions.append("messages.timestamp >= ?")
@@ -99,92 +263,55 @@ class MessageRepository:
         
         where_clause = " AND ".join(conditions) if conditions else "1=1"
         
-        query_sql = f"""
-            SELECT messages.*, chats.name as chat_name
-            FROM messages
-            LEFT JOIN chats ON messages.chat_jid = chats.jid
-            WHERE {where_clause}
-            ORDER BY messages.timestamp DESC
-            LIMIT ? OFFSET ?
-        """
+        query_sql = _Q_SEARCH_MESSAGES_TEMPLATE.format(
+            from_clause=from_clause,
+            where_clause=where_clause
+        )
         
         params.extend([limit, offset])
         
         rows = self.db.execute_query(query_sql, tuple(params))
-        return [self._row_to_message(row) for row in rows]
+        return [self._row_to_message(row, raw_timestamp) for row in rows]
     
     def get_message_context(
         self,
         message_id: str,
         before: int = 5,
-        after: int = 5
+        after: int = 5,
+        raw_timestamp: bool = False
     ) -> Optional[MessageContext]:
         """Get context around a specific message."""
         
-        # First, get the target message
-        target_query = """
-            SELECT messages.*, chats.name as chat_name
-            FROM messages
-            LEFT JOIN chats ON messages.chat_jid = chats.jid
-            WHERE messages.id = ?
-        """
-        
-        target_rows = self.db.execute_query(target_query, (message_id,))
-        if not target_rows:
-            return None
-        
-        target_message = self._row_to_message(target_rows[0])
+        rows = self.db.execute_query(_Q_MESSAGE_CONTEXT, (message_id, before, after))
         
-        # Get messages before
-        before_query = """
-            SELECT messages.*, chats.name as chat_name
-            FROM messages
-            LEFT JOIN chats ON messages.chat_jid = chats.jid
-            WHERE messages.chat_jid = ? AND messages.timestamp < ?
-            ORDER BY messages.timestamp DESC
-            LIMIT ?
-        """
-        
-        before_rows = self.db.execute_query(
-            before_query,
-            (target_message.chat_jid, target_message.timestamp.isoformat(), before)
-        )
-        before_messages = [self._row_to_message(row) for row in before_rows]
-        before_messages.reverse()  # Chronological order
-        
-        # Get messages after
-        after_query = """
-            SELECT messages.*, chats.name as chat_name
-            FROM messages
-            LEFT JOIN chats ON messages.chat_jid = chats.jid
-            WHERE messages.chat_jid = ? AND messages.timestamp > ?
-            ORDER BY messages.timestamp ASC
-            LIMIT ?
-        """
+        # Rows arrive in chronological order, so each bucket is already sorted
+        buckets: Dict[str, List[Message]] = {'target': [], 'before': [], 'after': []}
+        for row in rows:
+            buckets[row.bucket].append(self._row_to_message(row, raw_timestamp))
         
-        after_rows = self.db.execute_query(
-            after_query,
-            (target_message.chat_jid, target_message.timestamp.isoformat(), after)
-        )
-        after_messages = [self._row_to_message(row) for row in after_rows]
+        if not buckets['target']:
+            return None
         
         return MessageContext(
-            message=target_message,
-            before=before_messages,
-            after=after_messages
+            message=buckets['target'][0],
+            before=buckets['before'],
+            after=buckets['after']
         )
     
-    def _row_to_message(self, row: sqlite3.Row) -> Message:
+    def _row_to_message(self, row: Any, raw_timestamp: bool = False) -> Message:
         """Convert database row to Message object."""
         return Message(
-            id=row['id'],
-            timestamp=datetime.fromisoformat(row['timestamp']),
-            sender=row['sender'],
-            content=row['content'] or '',
-            is_from_me=bool(row['is_from_me']),
-            chat_jid=row['chat_jid'],
-            chat_name=row.get('chat_name'),
-            media_type=row.get('media_type')
+            id=row.id,
+            timestamp=(
+                row.timestamp if raw_timestamp
+                else datetime.fromisoformat(row.timestamp)
+            ),
+            sender=row.sender,
+            content=row.content or '',
+            is_from_me=bool(row.is_from_me),
+            chat_jid=row.chat_jid,
+            chat_name=row.chat_name,
+            media_type=row.media_type
         )
 
 
@@ -199,46 +326,83 @@ class ChatRepository:
         query: Optional[str] = None,
         limit: int = 20,
         offset: int = 0,
-        sort_by: str = "last_active"
+        sort_by: str = "last_active",
+        exact_prefix: bool = False
     ) -> List[Chat]:
-        """Search chats with filters."""
+        """Search chats with filters.
+        
+        Like search_messages, query matches words or word prefixes of the
+        name or JID when chats_fts exists, and substrings otherwise.
+        """
+        
+        if query and exact_prefix:
+            return self.search_chats_by_prefix(query, limit, offset, sort_by)
         
         conditions = []
-        params = []
+        params: List[Any] = []
         
-        if query:
+        # Use the full-text index when the bridge has created it
+        fts_query = build_fts_query(query) if query else None
+        if fts_query and self.db.has_table('chats_fts'):
+            conditions.append(
+                "chats.rowid IN (SELECT docid FROM chats_fts WHERE chats_fts MATCH ?)"
+            )
+            params.append(fts_query)
+        elif query:
             conditions.append("(chats.name LIKE ? OR chats.jid LIKE ?)")
             params.extend([f"%{query}%", f"%{query}%"])
         
+        return self._query_chats(conditions, params, limit, offset, sort_by)
+    
+    def search_chats_by_prefix(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        sort_by: str = "last_active"
+    ) -> List[Chat]:
+        """Search chats whose name or JID starts with the query."""
+        
+        # Anchored patterns let the NOCASE name and JID indexes serve the lookup
+        pattern = f"{escape_like(query)}%"
+        conditions = ["(chats.name LIKE ? ESCAPE '\\' OR chats.jid LIKE ? ESCAPE '\\')"]
+        
+        return self._query_chats(conditions, [pattern, pattern], limit, offset, sort_by)
+    
+    def _query_chats(
+        self,
+        conditions: List[str],
+        params: List[Any],
+        limit: int,
+        offset: int,
+        sort_by: str
+    ) -> List[Chat]:
+        """Run a chat query with the given conditions, order and pagination."""
         where_clause = " AND ".join(conditions) if conditions else "1=1"
         
         order_by = "last_message_time DESC" if sort_by == "last_active" else "name ASC"
         
-        query_sql = f"""
-            SELECT jid, name, last_message_time
-            FROM chats
-            WHERE {where_clause}
-            ORDER BY {order_by}
-            LIMIT ? OFFSET ?
-        """
+        query_sql = _Q_SEARCH_CHATS_TEMPLATE.format(
+            where_clause=where_clause,
+            order_by=order_by
+        )
         
-        params.extend([limit, offset])
+        params = [*params, limit, offset]
         
         rows = self.db.execute_query(query_sql, tuple(params))
         return [self._row_to_chat(row) for row in rows]
     
     def get_chat_by_jid(self, jid: str) -> Optional[Chat]:
         """Get chat by JID."""
-        query = "SELECT jid, name, last_message_time FROM chats WHERE jid = ?"
-        rows = self.db.execute_query(query, (jid,))
+        rows = self.db.execute_query(_Q_CHAT_BY_JID, (jid,))
         return self._row_to_chat(rows[0]) if rows else None
     
-    def _row_to_chat(self, row: sqlite3.Row) -> Chat:
+    def _row_to_chat(self, row: Any) -> Chat:
         """Convert database row to Chat object."""
         return Chat(
-            jid=row['jid'],
-            name=row['name'],
-            last_message_time=datetime.fromisoformat(row['last_message_time']) if row['last_message_time'] else None
+            jid=row.jid,
+            name=row.name,
+            last_message_time=datetime.fromisoformat(row.last_message_time) if row.last_message_time else None
         )
 
 
@@ -2,15 +2,15 @@
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Union
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """Represents a WhatsApp message."""
     
     id: str
-    timestamp: datetime
+    timestamp: Union[datetime, str]  # str when loaded with raw_timestamp
     sender: str
     content: str
     is_from_me: bool
@@ -20,9 +20,12 @@ class Message:
     
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
+        timestamp = self.timestamp
         return {
             'id': self.id,
-            'timestamp': self.timestamp.isoformat(),
+            'timestamp': (
+                timestamp if isinstance(timestamp, str) else timestamp.isoformat()
+            ),
             'sender': self.sender,
             'content': self.content,
             'is_from_me': self.is_from_me,
@@ -32,7 +35,7 @@ class Message:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Chat:
     """Represents a WhatsApp chat."""
     
@@ -67,7 +70,7 @@ class Chat:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Contact:
     """Represents a WhatsApp contact."""
     
@@ -84,7 +87,7 @@ class Contact:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class MessageContext:
     """Represents a message with surrounding context."""
     
@@ -96,12 +99,12 @@ class MessageContext:
         """Convert to dictionary for JSON serialization."""
         return {
             'message': self.message.to_dict(),
-            'before': [msg.to_dict() for msg in self.before],
-            'after': [msg.to_dict() for msg in self.after],
+            'before': list(map(Message.to_dict, self.before)),
+            'after': list(map(Message.to_dict, self.after)),
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class APIResponse:
     """Standard API response format."""
     
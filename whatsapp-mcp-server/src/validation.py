@@ -2,7 +2,8 @@
 
 import re
 import os
-from pathlib import Path
+import stat
+from functools import lru_cache
 from typing import Optional
 from datetime import datetime
 
@@ -14,20 +15,68 @@ class ValidationError(Exception):
     pass
 
 
-# Regex patterns for validation
-PHONE_PATTERN = re.compile(r'^\d{10,15}$')
-JID_PHONE_PATTERN = re.compile(r'^\d{10,15}@s\.whatsapp\.net$')
-JID_GROUP_PATTERN = re.compile(r'^\d+-\d+@g\.us$')
+# Regex patterns for validation, used with fullmatch since '$' would also
+# accept a trailing newline
+PHONE_PATTERN = re.compile(r'\d{10,15}')
+JID_PHONE_PATTERN = re.compile(r'\d{10,15}@s\.whatsapp\.net')
+JID_GROUP_PATTERN = re.compile(r'\d+-\d+@g\.us')
+RECIPIENT_PATTERN = re.compile('|'.join(
+    f'(?:{pattern.pattern})'
+    for pattern in (PHONE_PATTERN, JID_PHONE_PATTERN, JID_GROUP_PATTERN)
+))
 DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}')
 
 
+# Cache size for memoized format checks; only valid inputs are cached since
+# lru_cache does not store raised exceptions
+VALIDATION_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _check_phone_number(phone: str) -> bool:
+    """Check phone number format, caching valid results."""
+    if not PHONE_PATTERN.fullmatch(phone):
+        raise ValidationError(f"Invalid phone number format: {phone} (should be 10-15 digits)")
+    return True
+
+
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _check_jid(jid: str) -> bool:
+    """Check JID format, caching valid results."""
+    if not (JID_PHONE_PATTERN.fullmatch(jid) or JID_GROUP_PATTERN.fullmatch(jid)):
+        raise ValidationError(f"Invalid JID format: {jid}")
+    return True
+
+
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _check_recipient(recipient: str) -> bool:
+    """Check recipient format, caching valid results."""
+    # Phone number, user JID or group JID in a single match
+    if not RECIPIENT_PATTERN.fullmatch(recipient):
+        raise ValidationError(f"Invalid recipient format: {recipient}")
+    return True
+
+
+@lru_cache(maxsize=256)
+def _ext_allowed(suffix: str) -> bool:
+    """Check a file suffix such as '.JPG' against the allowed file types."""
+    return suffix.lower().lstrip('.') in config.allowed_file_types
+
+
+def clear_validation_caches() -> None:
+    """Clear memoized validation results."""
+    _check_phone_number.cache_clear()
+    _check_jid.cache_clear()
+    _check_recipient.cache_clear()
+    _ext_allowed.cache_clear()
+
+
 def validate_phone_number(phone: str) -> None:
     """Validate phone number format."""
     if not phone:
         raise ValidationError("Phone number cannot be empty")
     
-    if not PHONE_PATTERN.match(phone):
-        raise ValidationError(f"Invalid phone number format: {phone} (should be 10-15 digits)")
+    _check_phone_number(phone)
 
 
 def validate_jid(jid: str) -> None:
@@ -35,8 +84,7 @@ def validate_jid(jid: str) -> None:
     if not jid:
         raise ValidationError("JID cannot be empty")
     
-    if not (JID_PHONE_PATTERN.match(jid) or JID_GROUP_PATTERN.match(jid)):
-        raise ValidationError(f"Invalid JID format: {jid}")
+    _check_jid(jid)
 
 
 def validate_recipient(recipient: str) -> None:
@@ -44,21 +92,7 @@ def validate_recipient(recipient: str) -> None:
     if not recipient:
         raise ValidationError("Recipient cannot be empty")
     
-    try:
-        # Try phone number first
-        validate_phone_number(recipient)
-        return
-    except ValidationError:
-        pass
-    
-    try:
-        # Try JID format
-        validate_jid(recipient)
-        return
-    except ValidationError:
-        pass
-    
-    raise ValidationError(f"Invalid recipient format: {recipient}")
+    _check_recipient(recipient)
 
 
 def validate_message_content(content: str) -> None:
@@ -78,32 +112,36 @@ def validate_file_path(file_path: str) -> str:
         raise ValidationError("File path cannot be empty")
     
     try:
-        # Convert to Path object for better handling
-        path = Path(file_path).resolve()
+        # Resolved on every call: a symlink may have been re-pointed since
+        # the last upload, so neither the target nor its stat is cached
+        path = os.path.realpath(file_path)
         
-        # Check if file exists
-        if not path.exists():
+        # Validate file extension before touching the filesystem
+        suffix = os.path.splitext(path)[1]
+        if not _ext_allowed(suffix):
+            file_ext = suffix.lower().lstrip('.')
+            allowed = ', '.join(sorted(config.allowed_file_types))
+            raise ValidationError(
+                f"Unsupported file type: {file_ext} (allowed: {allowed})"
+            )
+        
+        # A single stat call answers existence, file type and size
+        try:
+            file_stat = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
             raise ValidationError(f"File does not exist: {file_path}")
         
         # Check if it's a file (not directory)
-        if not path.is_file():
+        if not stat.S_ISREG(file_stat.st_mode):
             raise ValidationError(f"Path is not a file: {file_path}")
         
         # Check file size
-        file_size = path.stat().st_size
-        if file_size > config.max_file_size:
-            raise ValidationError(
-                f"File too large: {file_size} bytes (max {config.max_file_size})"
-            )
-        
-        # Validate file extension
-        file_ext = path.suffix.lower().lstrip('.')
-        if file_ext not in config.allowed_file_types:
+        if file_stat.st_size > config.max_file_size:
             raise ValidationError(
-                f"Unsupported file type: {file_ext} (allowed: {', '.join(config.allowed_file_types)})"
+                f"File too large: {file_stat.st_size} bytes (max {config.max_file_size})"
             )
         
-        return str(path)
+        return path
         
     except OSError as e:
         raise ValidationError(f"Invalid file path: {e}")
@@ -118,45 +156,56 @@ def validate_date_string(date_str: str) -> datetime:
         raise ValidationError(f"Invalid date format: {date_str} (expected ISO format)")
     
     try:
-        return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        # Python 3.11+ parses the 'Z' UTC designator natively
+        return datetime.fromisoformat(date_str)
     except ValueError as e:
         raise ValidationError(f"Invalid date: {e}")
 
 
+# Upper bounds for pagination and message context parameters
+_MAX_LIMIT = 100
+_MAX_CONTEXT = 50
+
+
 def validate_pagination_params(limit: int, page: int) -> tuple[int, int]:
     """Validate pagination parameters."""
-    if limit < 1 or limit > 100:
-        raise ValidationError("Limit must be between 1 and 100")
+    if not 1 <= limit <= _MAX_LIMIT:
+        raise ValidationError(f"Limit must be between 1 and {_MAX_LIMIT}")
     
     if page < 0:
         raise ValidationError("Page must be non-negative")
     
-    offset = page * limit
-    return limit, offset
+    return limit, page * limit
 
 
 def validate_context_params(before: int, after: int) -> tuple[int, int]:
     """Validate context parameters."""
-    if before < 0 or before > 50:
-        raise ValidationError("Before context must be between 0 and 50")
+    if not 0 <= before <= _MAX_CONTEXT:
+        raise ValidationError(f"Before context must be between 0 and {_MAX_CONTEXT}")
     
-    if after < 0 or after > 50:
-        raise ValidationError("After context must be between 0 and 50")
+    if not 0 <= after <= _MAX_CONTEXT:
+        raise ValidationError(f"After context must be between 0 and {_MAX_CONTEXT}")
     
     return before, after
 
 
+# Doubles single quotes and deletes semicolons in one pass
+_SANITIZE_TRANS = str.maketrans({"'": "''", ";": None})
+
+
 def sanitize_search_query(query: str) -> str:
-    """Sanitize search query to prevent SQL injection."""
+    """Sanitize search query text for display or logging.
+    
+    Not needed before querying the database: repositories bind search text
+    as query parameters and quote it for full-text MATCH themselves, so
+    pre-escaped input would be searched for literally.
+    """
     if not query:
         return ""
     
-    # Remove or escape potentially dangerous characters
-    # This is a basic sanitization - for production, use parameterized queries
-    sanitized = query.replace("'", "''").replace(";", "").replace("--", "")
+    # Remove or escape potentially dangerous characters; '--' is stripped after
+    # semicolons so '-;-' cannot reassemble into a comment
+    sanitized = query.translate(_SANITIZE_TRANS).replace("--", "")
     
     # Limit query length
-    if len(sanitized) > 100:
-        sanitized = sanitized[:100]
-    
-    return sanitized.strip()
\ No newline at end of file
+    return sanitized[:100].strip()
\ No newline at end of file
@@ -5,10 +5,25 @@ import tempfile
 import sqlite3
 import os
 from datetime import datetime
-from pathlib import Path
 
 from src.database import DatabaseManager
-from src.models import Message, Chat
+from src.models import Message, Chat, Contact
+
+
+def pytest_configure(config):
+    """Register markers (pytest.ini's [tool:pytest] section is not read)."""
+    config.addinivalue_line("markers", "benchmark: Bulk workload tests, run with -m benchmark")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip benchmark tests unless selected with -m benchmark."""
+    if "benchmark" in config.getoption("markexpr"):
+        return
+    
+    skip = pytest.mark.skip(reason="benchmark tests run only with -m benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
 
 
 @pytest.fixture
@@ -45,6 +60,72 @@ def temp_db():
             FOREIGN KEY (chat_jid) REFERENCES chats(jid)
         )
     """)
+    # Mirrors the bridge's indexes and search indexes
+    conn.executescript("""
+        CREATE INDEX idx_messages_chat_timestamp ON messages(chat_jid, timestamp);
+        CREATE INDEX idx_messages_timestamp ON messages(timestamp);
+        CREATE INDEX idx_messages_sender_nocase ON messages(sender COLLATE NOCASE);
+        CREATE INDEX idx_chats_last_message_time ON chats(last_message_time);
+        CREATE INDEX idx_chats_name_nocase ON chats(name COLLATE NOCASE);
+        CREATE INDEX idx_chats_jid_nocase ON chats(jid COLLATE NOCASE);
+        
+        CREATE VIRTUAL TABLE messages_fts USING fts4(
+            content="messages",
+            content,
+            tokenize=unicode61 "remove_diacritics=2"
+        );
+        
+        CREATE TRIGGER messages_fts_bi BEFORE INSERT ON messages BEGIN
+            DELETE FROM messages_fts WHERE docid IN (
+                SELECT rowid FROM messages WHERE id = new.id AND chat_jid = new.chat_jid
+            );
+        END;
+        
+        CREATE TRIGGER messages_fts_ai AFTER INSERT ON messages BEGIN
+            INSERT INTO messages_fts(docid, content) VALUES (new.rowid, new.content);
+        END;
+        
+        CREATE TRIGGER messages_fts_bu BEFORE UPDATE ON messages BEGIN
+            DELETE FROM messages_fts WHERE docid = old.rowid;
+        END;
+        
+        CREATE TRIGGER messages_fts_au AFTER UPDATE ON messages BEGIN
+            INSERT INTO messages_fts(docid, content) VALUES (new.rowid, new.content);
+        END;
+        
+        CREATE TRIGGER messages_fts_bd BEFORE DELETE ON messages BEGIN
+            DELETE FROM messages_fts WHERE docid = old.rowid;
+        END;
+        
+        CREATE VIRTUAL TABLE chats_fts USING fts4(
+            content="chats",
+            name,
+            jid,
+            tokenize=unicode61 "remove_diacritics=2"
+        );
+        
+        CREATE TRIGGER chats_fts_bi BEFORE INSERT ON chats BEGIN
+            DELETE FROM chats_fts WHERE docid IN (
+                SELECT rowid FROM chats WHERE jid = new.jid
+            );
+        END;
+        
+        CREATE TRIGGER chats_fts_ai AFTER INSERT ON chats BEGIN
+            INSERT INTO chats_fts(docid, name, jid) VALUES (new.rowid, new.name, new.jid);
+        END;
+        
+        CREATE TRIGGER chats_fts_bu BEFORE UPDATE ON chats BEGIN
+            DELETE FROM chats_fts WHERE docid = old.rowid;
+        END;
+        
+        CREATE TRIGGER chats_fts_au AFTER UPDATE ON chats BEGIN
+            INSERT INTO chats_fts(docid, name, jid) VALUES (new.rowid, new.name, new.jid);
+        END;
+        
+        CREATE TRIGGER chats_fts_bd BEFORE DELETE ON chats BEGIN
+            DELETE FROM chats_fts WHERE docid = old.rowid;
+        END;
+    """)
     conn.commit()
     conn.close()
     
@@ -57,40 +138,93 @@ def temp_db():
 @pytest.fixture
 def db_manager(temp_db):
     """Create a database manager for testing."""
-    return DatabaseManager(temp_db)
+    manager = DatabaseManager(temp_db)
+    
+    yield manager
+    
+    manager.close()
+
+
+@pytest.fixture
+def populated_db(temp_db):
+    """Populate the temporary database with a contact chat and a group chat."""
+    conn = sqlite3.connect(temp_db)
+    conn.executemany(
+        "INSERT INTO chats (jid, name, last_message_time) VALUES (?, ?, ?)",
+        [
+            ("1234567890@s.whatsapp.net", "Test Contact", "2023-01-01T12:05:00"),
+            ("123456789-123456789@g.us", "Test Group", "2023-01-02T09:00:00"),
+        ]
+    )
+    conn.executemany(
+        "INSERT INTO messages (id, chat_jid, sender, content, timestamp, is_from_me) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (f"msg{i}", "1234567890@s.whatsapp.net", "1234567890",
+             f"Message number {i}", f"2023-01-01T12:0{i}:00", i % 2)
+            for i in range(6)
+        ] + [
+            ("grp1", "123456789-123456789@g.us", "9876543210",
+             "Hello group", "2023-01-02T09:00:00", 0),
+        ]
+    )
+    conn.commit()
+    conn.close()
+    
+    return temp_db
 
 
 @pytest.fixture
-def sample_chat():
+def fixed_ts():
+    """Fixed timestamp for deterministic model tests."""
+    return datetime(2023, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def sample_chat(fixed_ts):
     """Create a sample chat for testing."""
     return Chat(
         jid="1234567890@s.whatsapp.net",
         name="Test Contact",
-        last_message_time=datetime.now()
+        last_message_time=fixed_ts,
+        last_message="Hello",
+        last_sender="1234567890@s.whatsapp.net",
+        last_is_from_me=False
     )
 
 
 @pytest.fixture
-def sample_message():
+def sample_message(fixed_ts):
     """Create a sample message for testing."""
     return Message(
         id="msg123",
-        timestamp=datetime.now(),
+        timestamp=fixed_ts,
         sender="1234567890@s.whatsapp.net",
         content="Test message",
         is_from_me=False,
         chat_jid="1234567890@s.whatsapp.net",
-        chat_name="Test Contact"
+        chat_name="Test Contact",
+        media_type="image"
     )
 
 
 @pytest.fixture
-def sample_group_chat():
+def sample_group_chat(fixed_ts):
     """Create a sample group chat for testing."""
     return Chat(
         jid="123456789-123456789@g.us",
         name="Test Group",
-        last_message_time=datetime.now()
+        last_message_time=fixed_ts
+    )
+
+
+@pytest.fixture
+def sample_contact():
+    """Create a sample contact for testing."""
+    return Contact(
+        phone_number="1234567890",
+        name="Test Contact",
+        jid="1234567890@s.whatsapp.net"
     )
 
 
@@ -121,4 +255,22 @@ def temp_media_file():
     
     # Cleanup
     if os.path.exists(temp_path):
-        os.unlink(temp_path)
\ No newline at end of file
+        os.unlink(temp_path)
+
+
+@pytest.fixture(scope="session")
+def sample_files(tmp_path_factory):
+    """Create files and directories shared by file path tests."""
+    base = tmp_path_factory.mktemp("fp")
+    txt = base / "a.txt"
+    txt.write_bytes(b"test")
+    exe = base / "b.exe"
+    exe.touch()
+    txt_dir = base / "dir.txt"
+    txt_dir.mkdir()
+    
+    return {
+        "txt": str(txt),
+        "exe": str(exe),
+        "txt_dir": str(txt_dir),
+    }
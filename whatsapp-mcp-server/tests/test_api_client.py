@@ -0,0 +1,363 @@
+"""Tests for api_client module."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from src import api_client
+from src.api_client import HEALTH_CHECK_TTL, AsyncWhatsAppAPIClient, WhatsAppAPIClient
+
+
+class BridgeHandler(BaseHTTPRequestHandler):
+    """Request handler replaying the responses configured on its server."""
+    
+    def _respond(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length') or 0)
+        server.requests.append((self.command, self.path, self.rfile.read(length)))
+        server.headers.append(self.headers)
+        
+        status, body, delay = server.responses.pop(0) if server.responses else server.default
+        if delay:
+            time.sleep(delay)
+        
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+    
+    do_GET = do_POST = do_HEAD = _respond
+    
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def bridge_server():
+    """Run a local bridge stand-in that records every request it receives."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), BridgeHandler)
+    server.daemon_threads = True
+    server.requests = []
+    server.headers = []
+    server.responses = []
+    server.default = (200, b'{"success": true, "message": "ok"}', 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    
+    yield server
+    
+    server.shutdown()
+    server.server_close()
+
+
+class MockBridge:
+    """Mock transport handler that records requests and replays a response."""
+    
+    def __init__(self):
+        self.requests = []
+        self.respond = lambda request: httpx.Response(
+            200, json={'success': True, 'message': 'ok'}
+        )
+    
+    def __call__(self, request):
+        self.requests.append(request)
+        return self.respond(request)
+
+
+@pytest.fixture
+def mock_bridge():
+    """Create a mock bridge answering every request successfully."""
+    return MockBridge()
+
+
+@pytest_asyncio.fixture
+async def async_client(mock_bridge):
+    """Create an async client that talks to the mock bridge."""
+    client = AsyncWhatsAppAPIClient(
+        base_url="http://bridge/api",
+        transport=httpx.MockTransport(mock_bridge)
+    )
+    
+    yield client
+    
+    await client.close()
+
+
+@pytest.fixture
+def sync_client(bridge_server):
+    """Create a client pointed at the local bridge stand-in."""
+    host, port = bridge_server.server_address
+    client = WhatsAppAPIClient(base_url=f"http://{host}:{port}/api", timeout=5)
+    
+    yield client
+    
+    client.close()
+
+
+class TestWhatsAppAPIClient:
+    """Test the synchronous bridge client."""
+    
+    def test_send_message(self, bridge_server, sync_client):
+        """Test a successful send posts a JSON body once."""
+        success, message = sync_client.send_message("1234567890", "hello")
+        
+        assert (success, message) == (True, "ok")
+        assert len(bridge_server.requests) == 1
+        method, path, body = bridge_server.requests[0]
+        assert (method, path) == ('POST', '/api/send')
+        assert b'"message":"hello"' in body
+    
+    def test_send_message_not_retried_on_server_error(self, bridge_server, sync_client):
+        """Test a 503 from /send is reported without resending the message."""
+        bridge_server.default = (503, b'unavailable', 0)
+        
+        success, message = sync_client.send_message("1234567890", "hello")
+        
+        assert success is False
+        assert message.startswith("HTTP 503")
+        assert len(bridge_server.requests) == 1
+    
+    def test_send_message_not_retried_on_read_timeout(self, bridge_server, sync_client):
+        """Test a slow /send is not delivered a second time."""
+        bridge_server.default = (200, b'{"success": true}', 0.5)
+        sync_client.timeout = 0.2
+        
+        success, message = sync_client.send_message("1234567890", "hello")
+        
+        assert success is False
+        assert message.startswith("Network error")
+        assert len(bridge_server.requests) == 1
+    
+    def test_send_file_streams_multipart(self, bridge_server, sync_client, temp_file):
+        """Test a file upload sends the file as multipart form data."""
+        success, message = sync_client.send_file("1234567890", temp_file)
+        
+        assert (success, message) == (True, "ok")
+        method, path, body = bridge_server.requests[0]
+        assert (method, path) == ('POST', '/api/send')
+        assert b'name="recipient"' in body
+        assert b'test content' in body
+    
+    def test_send_file_not_retried(self, bridge_server, sync_client, temp_file):
+        """Test a failed upload is reported instead of resent with an empty body."""
+        bridge_server.responses.append((503, b'unavailable', 0))
+        
+        success, message = sync_client.send_file("1234567890", temp_file)
+        
+        assert (success, message) == (False, "HTTP 503: unavailable")
+        assert len(bridge_server.requests) == 1
+        assert b'test content' in bridge_server.requests[0][2]
+        adapter = sync_client._no_retry_session.get_adapter(sync_client.base_url)
+        assert adapter.max_retries.total == 0
+    
+    def test_send_file_shares_session_cookies(self, bridge_server, sync_client, temp_file):
+        """Test uploads send the same cookies as other bridge requests."""
+        sync_client.session.cookies.set('session', 'abc123')
+        
+        success, _ = sync_client.send_file("1234567890", temp_file)
+        
+        assert success is True
+        assert bridge_server.headers[0]['Cookie'] == 'session=abc123'
+    
+    def test_send_file_honors_proxy_environment(
+        self, bridge_server, sync_client, temp_file, monkeypatch
+    ):
+        """Test uploads pick up proxy settings from the environment."""
+        for name in ('NO_PROXY', 'no_proxy'):
+            monkeypatch.delenv(name, raising=False)
+        # Nothing listens on port 1, so a proxied upload fails to connect
+        monkeypatch.setenv('HTTP_PROXY', 'http://127.0.0.1:1')
+        
+        success, message = sync_client.send_file("1234567890", temp_file)
+        
+        assert success is False
+        assert message.startswith("Network error")
+        assert bridge_server.requests == []
+    
+    def test_health_check_cached_within_ttl(self, bridge_server, sync_client, monkeypatch):
+        """Test one HEAD request serves health checks until the TTL expires."""
+        clock = [1000.0]
+        monkeypatch.setattr(api_client.time, 'monotonic', lambda: clock[0])
+        
+        assert sync_client.health_check() is True
+        clock[0] += HEALTH_CHECK_TTL - 0.1
+        assert sync_client.health_check() is True
+        assert [request[0] for request in bridge_server.requests] == ['HEAD']
+        
+        clock[0] += 0.2
+        assert sync_client.health_check() is True
+        assert [request[0] for request in bridge_server.requests] == ['HEAD', 'HEAD']
+    
+    def test_health_check_not_retried(self, bridge_server, sync_client, monkeypatch):
+        """Test a hung bridge fails one health probe within its timeout."""
+        monkeypatch.setattr(api_client, 'HEALTH_CHECK_TIMEOUT', 0.3)
+        bridge_server.default = (200, b'', 2)
+        
+        start = time.monotonic()
+        assert sync_client.health_check() is False
+        elapsed = time.monotonic() - start
+        
+        assert [request[0] for request in bridge_server.requests] == ['HEAD']
+        assert elapsed < 0.3 + 0.5
+    
+    def test_health_check_caches_failures(self, bridge_server, sync_client, monkeypatch):
+        """Test an unhealthy result is also reused within the TTL."""
+        clock = [1000.0]
+        monkeypatch.setattr(api_client.time, 'monotonic', lambda: clock[0])
+        bridge_server.default = (503, b'', 0)
+        
+        assert sync_client.health_check() is False
+        sent = len(bridge_server.requests)
+        assert sync_client.health_check() is False
+        assert len(bridge_server.requests) == sent
+        
+        bridge_server.default = (200, b'', 0)
+        clock[0] += HEALTH_CHECK_TTL
+        assert sync_client.health_check() is True
+        assert len(bridge_server.requests) == sent + 1
+
+
+class TestAsyncWhatsAppAPIClient:
+    """Test the asynchronous bridge client."""
+    
+    @pytest.mark.asyncio
+    async def test_send_message(self, async_client, mock_bridge):
+        """Test a successful send posts a JSON body."""
+        success, message = await async_client.send_message("1234567890", "hello")
+        
+        assert (success, message) == (True, "ok")
+        request = mock_bridge.requests[0]
+        assert request.method == 'POST'
+        assert request.url.path == '/api/send'
+        assert request.headers['Content-Type'] == 'application/json'
+        assert b'"message":"hello"' in request.content
+    
+    @pytest.mark.asyncio
+    async def test_send_empty_message(self, async_client, mock_bridge):
+        """Test an empty message is rejected without a request."""
+        success, message = await async_client.send_message("1234567890", "   ")
+        
+        assert (success, message) == (False, "Message content cannot be empty")
+        assert mock_bridge.requests == []
+    
+    @pytest.mark.asyncio
+    async def test_send_message_http_error(self, async_client, mock_bridge):
+        """Test a non-200 response is reported with its status."""
+        mock_bridge.respond = lambda request: httpx.Response(503, text="unavailable")
+        
+        success, message = await async_client.send_message("1234567890", "hello")
+        
+        assert (success, message) == (False, "HTTP 503: unavailable")
+    
+    @pytest.mark.asyncio
+    async def test_send_message_network_error(self, async_client, mock_bridge):
+        """Test transport failures are reported as network errors."""
+        def refuse(request):
+            raise httpx.ConnectError("connection refused", request=request)
+        
+        mock_bridge.respond = refuse
+        
+        success, message = await async_client.send_message("1234567890", "hello")
+        
+        assert (success, message) == (False, "Network error: connection refused")
+    
+    @pytest.mark.asyncio
+    async def test_send_file_streams_multipart(self, async_client, mock_bridge, temp_file):
+        """Test a file upload streams a multipart body with a known length."""
+        success, message = await async_client.send_file("1234567890", temp_file)
+        
+        assert (success, message) == (True, "ok")
+        request = mock_bridge.requests[0]
+        assert request.headers['Content-Type'].startswith('multipart/form-data')
+        assert int(request.headers['Content-Length']) == len(request.content)
+        assert b'name="recipient"' in request.content
+        assert b'test content' in request.content
+    
+    @pytest.mark.asyncio
+    async def test_download_media(self, async_client, mock_bridge):
+        """Test a successful download returns the saved file path."""
+        mock_bridge.respond = lambda request: httpx.Response(
+            200, json={'success': True, 'file_path': '/tmp/media.jpg'}
+        )
+        
+        assert await async_client.download_media("msg1", "chat1") == '/tmp/media.jpg'
+    
+    @pytest.mark.asyncio
+    async def test_download_media_failure(self, async_client, mock_bridge):
+        """Test an unsuccessful download returns None."""
+        mock_bridge.respond = lambda request: httpx.Response(
+            200, json={'success': False, 'message': 'not found'}
+        )
+        
+        assert await async_client.download_media("msg1", "chat1") is None
+    
+    @pytest.mark.asyncio
+    async def test_download_media_requires_ids(self, async_client, mock_bridge):
+        """Test missing identifiers skip the request."""
+        assert await async_client.download_media("", "chat1") is None
+        assert mock_bridge.requests == []
+    
+    @pytest.mark.asyncio
+    async def test_download_many_keeps_order(self, async_client, mock_bridge):
+        """Test results follow the input order, with None for failures."""
+        async def respond(request):
+            message_id = json.loads(request.content)['message_id']
+            # Finish in reverse order so ordering cannot come from completion
+            await asyncio.sleep(0.01 * (3 - int(message_id[-1])))
+            if message_id == "msg1":
+                return httpx.Response(200, json={'success': False, 'message': 'gone'})
+            return httpx.Response(200, json={'success': True, 'file_path': f"/tmp/{message_id}"})
+        
+        mock_bridge.respond = respond
+        
+        results = await async_client.download_many(
+            [("msg0", "chat"), ("msg1", "chat"), ("msg2", "chat")], concurrency=3
+        )
+        
+        assert results == ["/tmp/msg0", None, "/tmp/msg2"]
+    
+    @pytest.mark.asyncio
+    async def test_download_many_bounds_concurrency(self, async_client, mock_bridge):
+        """Test no more than `concurrency` downloads are in flight at once."""
+        in_flight = 0
+        peak = 0
+        
+        async def respond(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json={'success': True, 'file_path': '/tmp/media'})
+        
+        mock_bridge.respond = respond
+        
+        results = await async_client.download_many(
+            [(f"msg{i}", "chat") for i in range(20)], concurrency=4
+        )
+        
+        assert len(results) == 20
+        assert peak == 4
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("concurrency", [0, -1])
+    async def test_download_many_rejects_invalid_concurrency(self, async_client, concurrency):
+        """Test a concurrency below one is rejected instead of hanging."""
+        with pytest.raises(ValueError):
+            await async_client.download_many([("msg0", "chat")], concurrency=concurrency)
+    
+    @pytest.mark.asyncio
+    async def test_health_check_cached(self, async_client, mock_bridge):
+        """Test repeated health checks reuse the first HEAD request."""
+        assert await async_client.health_check() is True
+        assert await async_client.health_check() is True
+        
+        assert [request.method for request in mock_bridge.requests] == ['HEAD']
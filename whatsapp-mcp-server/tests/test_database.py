@@ -0,0 +1,250 @@
+"""Tests for database module."""
+
+import pytest
+
+from src.database import (
+    ChatRepository,
+    DatabaseError,
+    MessageRepository,
+    build_fts_query,
+    escape_like
+)
+
+
+@pytest.fixture
+def message_repo(populated_db, db_manager):
+    """Create a message repository backed by the populated database."""
+    return MessageRepository(db_manager)
+
+
+@pytest.fixture
+def chat_repo(populated_db, db_manager):
+    """Create a chat repository backed by the populated database."""
+    return ChatRepository(db_manager)
+
+
+class TestDatabaseManager:
+    """Test database connection management."""
+    
+    def test_connection_is_reused(self, db_manager):
+        """Test queries share a single connection."""
+        with db_manager.get_connection() as first:
+            pass
+        with db_manager.get_connection() as second:
+            pass
+        
+        assert first is second
+    
+    def test_wal_mode(self, db_manager):
+        """Test the connection runs in WAL journal mode."""
+        rows = db_manager.execute_query("PRAGMA journal_mode")
+        assert rows[0][0] == "wal"
+    
+    def test_close(self, db_manager):
+        """Test closing reopens a fresh connection on next use."""
+        with db_manager.get_connection() as first:
+            pass
+        db_manager.close()
+        with db_manager.get_connection() as second:
+            pass
+        
+        assert first is not second
+    
+    def test_rows_are_named_tuples(self, populated_db, db_manager):
+        """Test rows support both attribute and positional access."""
+        rows = db_manager.execute_query("SELECT jid, name FROM chats ORDER BY jid")
+        
+        assert rows[0].jid == "123456789-123456789@g.us"
+        assert rows[0][1] == "Test Group"
+    
+    def test_has_table_caches_missing_tables(self, db_manager):
+        """Test a missing table is remembered until the manager is closed."""
+        assert db_manager.has_table("later_table") is False
+        db_manager.execute_update("CREATE TABLE later_table (id INTEGER)")
+        assert db_manager.has_table("later_table") is False
+        
+        db_manager.close()
+        assert db_manager.has_table("later_table") is True
+    
+    def test_query_error(self, db_manager):
+        """Test SQLite errors are wrapped in DatabaseError."""
+        with pytest.raises(DatabaseError):
+            db_manager.execute_query("SELECT * FROM missing_table")
+
+
+class TestMessageContext:
+    """Test message context retrieval."""
+    
+    def test_context_around_message(self, message_repo):
+        """Test before and after messages are returned in chronological order."""
+        context = message_repo.get_message_context("msg3", before=2, after=1)
+        
+        assert context.message.id == "msg3"
+        assert context.message.chat_name == "Test Contact"
+        assert [msg.id for msg in context.before] == ["msg1", "msg2"]
+        assert [msg.id for msg in context.after] == ["msg4"]
+    
+    def test_context_at_chat_start(self, message_repo):
+        """Test context for the first message in a chat."""
+        context = message_repo.get_message_context("msg0", before=5, after=5)
+        
+        assert context.before == []
+        assert [msg.id for msg in context.after] == ["msg1", "msg2", "msg3", "msg4", "msg5"]
+    
+    def test_context_stays_in_chat(self, message_repo):
+        """Test context does not include messages from other chats."""
+        context = message_repo.get_message_context("grp1")
+        
+        assert context.message.chat_jid == "123456789-123456789@g.us"
+        assert context.before == []
+        assert context.after == []
+    
+    def test_missing_message(self, message_repo):
+        """Test context for an unknown message ID."""
+        assert message_repo.get_message_context("missing") is None
+    
+    def test_context_query_uses_index(self, db_manager):
+        """Test per-chat timestamp lookups are served by the composite index."""
+        plan = db_manager.execute_query(
+            "EXPLAIN QUERY PLAN SELECT * FROM messages "
+            "WHERE chat_jid = ? AND timestamp < ? ORDER BY timestamp DESC LIMIT 5",
+            ("chat", "2023-01-01T00:00:00")
+        )
+        assert "idx_messages_chat_timestamp" in plan[0].detail
+
+
+class TestSearchMessages:
+    """Test message search."""
+    
+    def test_full_text_search(self, message_repo):
+        """Test searching message content through the full-text index."""
+        results = message_repo.search_messages(query="number 3")
+        assert [msg.id for msg in results] == ["msg3"]
+    
+    def test_prefix_search(self, message_repo):
+        """Test the last search word matches as a prefix."""
+        results = message_repo.search_messages(query="gro")
+        assert [msg.id for msg in results] == ["grp1"]
+    
+    def test_search_does_not_match_inside_words(self, message_repo):
+        """Test indexed search only matches from the start of a word."""
+        assert message_repo.search_messages(query="ello") == []
+    
+    def test_search_with_chat_filter(self, message_repo):
+        """Test combining a text query with a chat filter."""
+        results = message_repo.search_messages(
+            query="message", chat_jid="1234567890@s.whatsapp.net", limit=3
+        )
+        assert [msg.id for msg in results] == ["msg5", "msg4", "msg3"]
+    
+    def test_search_with_sql_and_fts_syntax(self, message_repo):
+        """Test raw query text is bound as data, not SQL or FTS syntax."""
+        results = message_repo.search_messages(query="'; DROP TABLE messages; -- \"group")
+        
+        assert results == []
+        assert len(message_repo.search_messages(limit=100)) == 7
+    
+    def test_search_with_raw_timestamp(self, message_repo):
+        """Test raw timestamps are kept as stored strings and serialized as-is."""
+        results = message_repo.search_messages(query="group", raw_timestamp=True)
+        
+        assert results[0].timestamp == "2023-01-02T09:00:00"
+        assert results[0].to_dict()['timestamp'] == "2023-01-02T09:00:00"
+    
+    def test_search_by_sender(self, message_repo):
+        """Test sender filter matches phone number prefixes."""
+        results = message_repo.search_messages(sender_phone_number="98765")
+        assert [msg.id for msg in results] == ["grp1"]
+    
+    def test_search_by_sender_matches_wildcards_literally(self, message_repo):
+        """Test LIKE wildcards in the sender are not treated as patterns."""
+        assert message_repo.search_messages(sender_phone_number="%") == []
+        assert message_repo.search_messages(sender_phone_number="_876") == []
+    
+    def test_sender_query_uses_index(self, db_manager):
+        """Test the escaped sender prefix is served by the sender index."""
+        plan = db_manager.execute_query(
+            "EXPLAIN QUERY PLAN SELECT * FROM messages WHERE sender LIKE ? ESCAPE '\\'",
+            ("98765%",)
+        )
+        assert "idx_messages_sender_nocase" in plan[0].detail
+    
+    def test_search_without_index(self, message_repo, db_manager):
+        """Test substring search falls back to LIKE without the index."""
+        db_manager.execute_update("DROP TABLE messages_fts")
+        
+        results = message_repo.search_messages(query="ello gr")
+        assert [msg.id for msg in results] == ["grp1"]
+        
+        results = message_repo.search_messages(query="'; DROP TABLE messages; --")
+        assert results == []
+        assert len(message_repo.search_messages(limit=100)) == 7
+
+
+class TestSearchChats:
+    """Test chat search."""
+    
+    def test_full_text_search(self, chat_repo):
+        """Test any word of the name or JID can match."""
+        results = chat_repo.search_chats(query="contact")
+        assert [chat.name for chat in results] == ["Test Contact"]
+    
+    def test_prefix_search(self, chat_repo):
+        """Test prefix search is anchored at the start of name or JID."""
+        results = chat_repo.search_chats(query="Test", exact_prefix=True)
+        assert [chat.name for chat in results] == ["Test Group", "Test Contact"]
+        
+        assert chat_repo.search_chats(query="Contact", exact_prefix=True) == []
+    
+    def test_prefix_search_by_jid(self, chat_repo):
+        """Test prefix search matches JIDs."""
+        results = chat_repo.search_chats_by_prefix("1234567890")
+        assert [chat.jid for chat in results] == ["1234567890@s.whatsapp.net"]
+    
+    def test_prefix_search_escapes_wildcards(self, chat_repo):
+        """Test LIKE wildcards in the query match literally."""
+        assert chat_repo.search_chats_by_prefix("Test_") == []
+        assert chat_repo.search_chats_by_prefix("%") == []
+    
+    def test_search_without_index(self, chat_repo, db_manager):
+        """Test substring search falls back to LIKE without the index."""
+        db_manager.execute_update("DROP TABLE chats_fts")
+        
+        results = chat_repo.search_chats(query="ntac")
+        assert [chat.name for chat in results] == ["Test Contact"]
+    
+    def test_get_chat_by_jid(self, chat_repo):
+        """Test fetching a single chat."""
+        chat = chat_repo.get_chat_by_jid("123456789-123456789@g.us")
+        
+        assert chat.name == "Test Group"
+        assert chat.is_group is True
+        assert chat_repo.get_chat_by_jid("missing@g.us") is None
+
+
+class TestBuildFTSQuery:
+    """Test full-text query construction."""
+    
+    def test_phrase_query(self):
+        """Test words are joined into a quoted prefix phrase."""
+        assert build_fts_query("hello world") == '"hello world*"'
+    
+    def test_operators_are_quoted(self):
+        """Test FTS operators and quotes in input are neutralised."""
+        assert build_fts_query('a OR "b" NEAR c*') == '"a OR b NEAR c*"'
+    
+    def test_no_searchable_words(self):
+        """Test punctuation-only input yields no query."""
+        assert build_fts_query("!!! --") is None
+
+
+class TestEscapeLike:
+    """Test LIKE pattern escaping."""
+    
+    def test_wildcards_escaped(self):
+        """Test % and _ and the escape character itself are escaped."""
+        assert escape_like("50%_off\\") == "50\\%\\_off\\\\"
+    
+    def test_plain_text_unchanged(self):
+        """Test text without wildcards is unchanged."""
+        assert escape_like("Test Contact") == "Test Contact"
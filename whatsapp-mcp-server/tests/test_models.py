@@ -1,6 +1,5 @@
 """Tests for models module."""
 
-import pytest
 from datetime import datetime
 
 from src.models import Message, Chat, Contact, MessageContext, APIResponse
@@ -32,26 +31,18 @@ class TestMessage:
         assert message.chat_name == "Test Contact"
         assert message.media_type is None
     
-    def test_message_to_dict(self):
+    def test_message_uses_slots(self, sample_message):
+        """Test messages carry no per-instance __dict__."""
+        assert not hasattr(sample_message, '__dict__')
+    
+    def test_message_to_dict(self, sample_message):
         """Test message to dictionary conversion."""
-        timestamp = datetime(2023, 1, 1, 12, 0, 0)
-        message = Message(
-            id="msg123",
-            timestamp=timestamp,
-            sender="1234567890@s.whatsapp.net",
-            content="Hello, world!",
-            is_from_me=False,
-            chat_jid="1234567890@s.whatsapp.net",
-            chat_name="Test Contact",
-            media_type="image"
-        )
-        
-        result = message.to_dict()
+        result = sample_message.to_dict()
         expected = {
             'id': "msg123",
             'timestamp': "2023-01-01T12:00:00",
             'sender': "1234567890@s.whatsapp.net",
-            'content': "Hello, world!",
+            'content': "Test message",
             'is_from_me': False,
             'chat_jid': "1234567890@s.whatsapp.net",
             'chat_name': "Test Contact",
@@ -83,55 +74,19 @@ class TestChat:
         assert chat.last_sender == "1234567890@s.whatsapp.net"
         assert chat.last_is_from_me is False
     
-    def test_is_group_property(self):
+    def test_is_group_property(self, sample_chat, sample_group_chat):
         """Test is_group property."""
-        # Contact chat
-        contact_chat = Chat(
-            jid="1234567890@s.whatsapp.net",
-            name="Contact",
-            last_message_time=None
-        )
-        assert contact_chat.is_group is False
-        
-        # Group chat
-        group_chat = Chat(
-            jid="123456789-123456789@g.us",
-            name="Group",
-            last_message_time=None
-        )
-        assert group_chat.is_group is True
+        assert sample_chat.is_group is False
+        assert sample_group_chat.is_group is True
     
-    def test_is_contact_property(self):
+    def test_is_contact_property(self, sample_chat, sample_group_chat):
         """Test is_contact property."""
-        # Contact chat
-        contact_chat = Chat(
-            jid="1234567890@s.whatsapp.net",
-            name="Contact",
-            last_message_time=None
-        )
-        assert contact_chat.is_contact is True
-        
-        # Group chat
-        group_chat = Chat(
-            jid="123456789-123456789@g.us",
-            name="Group",
-            last_message_time=None
-        )
-        assert group_chat.is_contact is False
+        assert sample_chat.is_contact is True
+        assert sample_group_chat.is_contact is False
     
-    def test_chat_to_dict(self):
+    def test_chat_to_dict(self, sample_chat):
         """Test chat to dictionary conversion."""
-        timestamp = datetime(2023, 1, 1, 12, 0, 0)
-        chat = Chat(
-            jid="1234567890@s.whatsapp.net",
-            name="Test Contact",
-            last_message_time=timestamp,
-            last_message="Hello",
-            last_sender="1234567890@s.whatsapp.net",
-            last_is_from_me=False
-        )
-        
-        result = chat.to_dict()
+        result = sample_chat.to_dict()
         expected = {
             'jid': "1234567890@s.whatsapp.net",
             'name': "Test Contact",
@@ -161,15 +116,9 @@ class TestContact:
         assert contact.name == "Test Contact"
         assert contact.jid == "1234567890@s.whatsapp.net"
     
-    def test_contact_to_dict(self):
+    def test_contact_to_dict(self, sample_contact):
         """Test contact to dictionary conversion."""
-        contact = Contact(
-            phone_number="1234567890",
-            name="Test Contact",
-            jid="1234567890@s.whatsapp.net"
-        )
-        
-        result = contact.to_dict()
+        result = sample_contact.to_dict()
         expected = {
             'phone_number': "1234567890",
             'name': "Test Contact",
@@ -227,13 +176,11 @@ class TestMessageContext:
         assert context.before == before_messages
         assert context.after == after_messages
     
-    def test_message_context_to_dict(self):
+    def test_message_context_to_dict(self, fixed_ts):
         """Test message context to dictionary conversion."""
-        timestamp = datetime(2023, 1, 1, 12, 0, 0)
-        
         target_message = Message(
             id="msg2",
-            timestamp=timestamp,
+            timestamp=fixed_ts,
             sender="sender",
             content="Target message",
             is_from_me=False,
@@ -254,6 +201,36 @@ class TestMessageContext:
         assert result['message']['id'] == "msg2"
         assert result['before'] == []
         assert result['after'] == []
+    
+    def test_message_context_to_dict_with_context(self, fixed_ts):
+        """Test message context conversion with surrounding messages."""
+        messages = [
+            Message(
+                id=f"msg{i}",
+                timestamp=fixed_ts,
+                sender="sender",
+                content=f"Message {i}",
+                is_from_me=False,
+                chat_jid="chat123"
+            )
+            for i in range(5)
+        ]
+        
+        context = MessageContext(
+            message=messages[2],
+            before=messages[:2],
+            after=messages[3:]
+        )
+        
+        result = context.to_dict()
+        
+        assert result['message']['id'] == "msg2"
+        assert len(result['before']) == 2
+        assert len(result['after']) == 2
+        assert [msg['id'] for msg in result['before']] == ["msg0", "msg1"]
+        assert [msg['id'] for msg in result['after']] == ["msg3", "msg4"]
+        assert result['before'][0]['timestamp'] == "2023-01-01T12:00:00"
+        assert result['after'][-1]['content'] == "Message 4"
 
 
 class TestAPIResponse:
@@ -291,6 +268,10 @@ class TestAPIResponse:
         
         assert result == expected
     
+    def test_response_uses_slots(self):
+        """Test responses carry no per-instance __dict__."""
+        assert not hasattr(APIResponse(success=True), '__dict__')
+    
     def test_minimal_response(self):
         """Test minimal API response."""
         response = APIResponse(success=True)
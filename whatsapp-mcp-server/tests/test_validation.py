@@ -1,10 +1,10 @@
 """Tests for validation module."""
 
-import pytest
-import tempfile
 import os
-from datetime import datetime
-from pathlib import Path
+import random
+import time
+import pytest
+from datetime import datetime, timedelta
 
 from src.validation import (
     ValidationError,
@@ -16,66 +16,118 @@ from src.validation import (
     validate_date_string,
     validate_pagination_params,
     validate_context_params,
-    sanitize_search_query
+    sanitize_search_query,
+    clear_validation_caches
 )
 
 
 class TestPhoneValidation:
     """Test phone number validation."""
     
-    def test_valid_phone_numbers(self):
+    @pytest.mark.parametrize("phone", ["1234567890", "123456789012345"])
+    def test_valid_phone_number(self, phone):
         """Test valid phone numbers."""
-        valid_phones = ["1234567890", "123456789012345"]
-        for phone in valid_phones:
-            validate_phone_number(phone)  # Should not raise
+        validate_phone_number(phone)  # Should not raise
     
-    def test_invalid_phone_numbers(self):
+    @pytest.mark.parametrize(
+        "phone",
+        ["", "123", "12345678901234567890", "abc123", "123-456-7890", "1234567890\n"]
+    )
+    def test_invalid_phone_number(self, phone):
         """Test invalid phone numbers."""
-        invalid_phones = ["", "123", "12345678901234567890", "abc123", "123-456-7890"]
-        for phone in invalid_phones:
-            with pytest.raises(ValidationError):
-                validate_phone_number(phone)
+        with pytest.raises(ValidationError):
+            validate_phone_number(phone)
 
 
 class TestJIDValidation:
     """Test JID validation."""
     
-    def test_valid_jids(self):
+    @pytest.mark.parametrize("jid", [
+        "1234567890@s.whatsapp.net",
+        "123456789-123456789@g.us"
+    ])
+    def test_valid_jid(self, jid):
         """Test valid JIDs."""
-        valid_jids = [
-            "1234567890@s.whatsapp.net",
-            "123456789-123456789@g.us"
-        ]
-        for jid in valid_jids:
-            validate_jid(jid)  # Should not raise
+        validate_jid(jid)  # Should not raise
     
-    def test_invalid_jids(self):
+    @pytest.mark.parametrize(
+        "jid", [
+            "", "invalid", "123@invalid.domain", "123456789@invalid",
+            "1234567890@s.whatsapp.net\n", "123456789-123456789@g.us\n"
+        ]
+    )
+    def test_invalid_jid(self, jid):
         """Test invalid JIDs."""
-        invalid_jids = ["", "invalid", "123@invalid.domain", "123456789@invalid"]
-        for jid in invalid_jids:
-            with pytest.raises(ValidationError):
-                validate_jid(jid)
+        with pytest.raises(ValidationError):
+            validate_jid(jid)
 
 
 class TestRecipientValidation:
     """Test recipient validation."""
     
-    def test_valid_recipients(self):
+    @pytest.mark.parametrize("recipient", [
+        "1234567890",
+        "1234567890@s.whatsapp.net",
+        "123456789-123456789@g.us"
+    ])
+    def test_valid_recipient(self, recipient):
         """Test valid recipients."""
-        valid_recipients = [
-            "1234567890",
-            "1234567890@s.whatsapp.net",
-            "123456789-123456789@g.us"
-        ]
-        for recipient in valid_recipients:
-            validate_recipient(recipient)  # Should not raise
+        validate_recipient(recipient)  # Should not raise
     
-    def test_invalid_recipients(self):
+    @pytest.mark.parametrize(
+        "recipient", ["", "invalid", "123@invalid.domain", "1234567890\n"]
+    )
+    def test_invalid_recipient(self, recipient):
         """Test invalid recipients."""
-        invalid_recipients = ["", "invalid", "123@invalid.domain"]
-        for recipient in invalid_recipients:
+        with pytest.raises(ValidationError):
+            validate_recipient(recipient)
+
+
+class TestValidationCache:
+    """Test memoized validation."""
+    
+    def test_repeated_validation(self):
+        """Test cached results keep valid and invalid inputs distinct."""
+        clear_validation_caches()
+        for _ in range(2):
+            validate_recipient("1234567890@s.whatsapp.net")  # Should not raise
             with pytest.raises(ValidationError):
-                validate_recipient(recipient)
+                validate_recipient("1234567890@invalid")
+    
+    def test_clear_caches(self):
+        """Test clearing caches does not change results."""
+        validate_phone_number("1234567890")
+        clear_validation_caches()
+        validate_phone_number("1234567890")  # Should not raise
+        with pytest.raises(ValidationError):
+            validate_jid("invalid")
+
+
+# Time budget for validating 10,000 uncached JIDs; a typical run takes ~10ms
+JID_BULK_BUDGET_SECONDS = 0.5
+
+
+@pytest.fixture(scope="module")
+def bulk_jids():
+    """Generate 10,000 valid user JIDs from a fixed seed."""
+    rng = random.Random(0)
+    return [f"{rng.randint(10**9, 10**15 - 1)}@s.whatsapp.net" for _ in range(10_000)]
+
+
+@pytest.mark.benchmark
+class TestBulkValidation:
+    """Bulk validation workloads."""
+    
+    def test_validate_jid_bulk(self, bulk_jids, record_property):
+        """Test validating 10,000 distinct JIDs stays within its time budget."""
+        clear_validation_caches()
+        start = time.perf_counter()
+        for jid in bulk_jids:
+            validate_jid(jid)  # Should not raise
+        elapsed = time.perf_counter() - start
+        
+        record_property("elapsed_seconds", elapsed)
+        assert elapsed < JID_BULK_BUDGET_SECONDS
 
 
 class TestMessageContentValidation:
@@ -85,32 +137,20 @@ class TestMessageContentValidation:
         """Test valid message content."""
         validate_message_content("Hello, world!")  # Should not raise
     
-    def test_empty_content(self):
-        """Test empty message content."""
+    @pytest.mark.parametrize("content", ["", "x" * 5000], ids=["empty", "too_long"])
+    def test_invalid_content(self, content):
+        """Test empty and overly long message content."""
         with pytest.raises(ValidationError):
-            validate_message_content("")
-    
-    def test_too_long_content(self):
-        """Test message content that's too long."""
-        long_content = "x" * 5000
-        with pytest.raises(ValidationError):
-            validate_message_content(long_content)
+            validate_message_content(content)
 
 
 class TestFilePathValidation:
     """Test file path validation."""
     
-    def test_valid_file_path(self):
+    def test_valid_file_path(self, sample_files):
         """Test valid file path."""
-        with tempfile.NamedTemporaryFile(suffix='.txt', delete=False) as f:
-            f.write(b"test content")
-            temp_path = f.name
-        
-        try:
-            result = validate_file_path(temp_path)
-            assert result == str(Path(temp_path).resolve())
-        finally:
-            os.unlink(temp_path)
+        result = validate_file_path(sample_files["txt"])
+        assert result == os.path.realpath(sample_files["txt"])
     
     def test_nonexistent_file(self):
         """Test nonexistent file path."""
@@ -122,44 +162,66 @@ class TestFilePathValidation:
         with pytest.raises(ValidationError):
             validate_file_path("")
     
-    def test_directory_path(self):
-        """Test directory path (should fail)."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with pytest.raises(ValidationError):
-                validate_file_path(temp_dir)
+    def test_directory_with_allowed_extension(self, sample_files):
+        """Test directory whose name has an allowed extension (should fail)."""
+        with pytest.raises(ValidationError, match="not a file"):
+            validate_file_path(sample_files["txt_dir"])
     
-    def test_unsupported_file_type(self):
+    def test_unsupported_file_type(self, sample_files):
         """Test unsupported file type."""
-        with tempfile.NamedTemporaryFile(suffix='.exe', delete=False) as f:
-            temp_path = f.name
+        with pytest.raises(ValidationError):
+            validate_file_path(sample_files["exe"])
+    
+    def test_cached_path_rechecks_existence(self, tmp_path):
+        """Test a cached resolution still detects a removed file."""
+        file_path = tmp_path / "gone.txt"
+        file_path.write_bytes(b"test")
+        validate_file_path(str(file_path))  # Should not raise
         
-        try:
-            with pytest.raises(ValidationError):
-                validate_file_path(temp_path)
-        finally:
-            os.unlink(temp_path)
+        file_path.unlink()
+        with pytest.raises(ValidationError, match="does not exist"):
+            validate_file_path(str(file_path))
+    
+    def test_repointed_symlink_resolves_to_new_target(self, tmp_path):
+        """Test a symlink re-pointed after validation resolves to its new target."""
+        first = tmp_path / "a.jpg"
+        second = tmp_path / "b.jpg"
+        first.write_bytes(b"first")
+        second.write_bytes(b"second")
+        link = tmp_path / "latest.jpg"
+        link.symlink_to(first)
+        assert validate_file_path(str(link)) == os.path.realpath(first)
+        
+        link.unlink()
+        link.symlink_to(second)
+        assert validate_file_path(str(link)) == os.path.realpath(second)
 
 
 class TestDateStringValidation:
     """Test date string validation."""
     
-    def test_valid_date_strings(self):
+    @pytest.mark.parametrize("date_str", [
+        "2023-01-01T00:00:00",
+        "2023-12-31T23:59:59",
+        "2023-06-15T12:30:45"
+    ])
+    def test_valid_date_string(self, date_str):
         """Test valid ISO date strings."""
-        valid_dates = [
-            "2023-01-01T00:00:00",
-            "2023-12-31T23:59:59",
-            "2023-06-15T12:30:45"
-        ]
-        for date_str in valid_dates:
-            result = validate_date_string(date_str)
-            assert isinstance(result, datetime)
+        result = validate_date_string(date_str)
+        assert isinstance(result, datetime)
     
-    def test_invalid_date_strings(self):
+    def test_utc_designator(self):
+        """Test a trailing 'Z' parses as UTC."""
+        result = validate_date_string("2023-01-01T00:00:00Z")
+        assert result.utcoffset() == timedelta(0)
+    
+    @pytest.mark.parametrize(
+        "date_str", ["", "invalid", "2023-13-01T00:00:00", "2023-01-32T00:00:00"]
+    )
+    def test_invalid_date_string(self, date_str):
         """Test invalid date strings."""
-        invalid_dates = ["", "invalid", "2023-13-01T00:00:00", "2023-01-32T00:00:00"]
-        for date_str in invalid_dates:
-            with pytest.raises(ValidationError):
-                validate_date_string(date_str)
+        with pytest.raises(ValidationError):
+            validate_date_string(date_str)
 
 
 class TestPaginationValidation:
@@ -219,6 +281,10 @@ class TestSearchQuerySanitization:
         assert "--" not in result  # Comments should be removed
         assert ";" not in result  # Semicolons should be removed
     
+    def test_escaped_output(self):
+        """Test quotes are doubled and split comment markers are removed."""
+        assert sanitize_search_query("it's -;- fine;") == "it''s  fine"
+    
     def test_empty_query(self):
         """Test empty search query."""
         result = sanitize_search_query("")